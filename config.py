@@ -3,29 +3,60 @@ Configuration module — loads environment variables and defines constants.
 """
 
 import os
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from dotenv import load_dotenv
 
-# Load .env from project root
-_env_path = Path(__file__).resolve().parent / ".env"
-load_dotenv(dotenv_path=_env_path)
+PROJECT_ROOT = Path(__file__).resolve().parent
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """Immutable snapshot of the environment-derived configuration."""
+
+    google_api_key: str
+    chroma_persist_dir: str
+    docstore_path: str
+    blobstore_path: str
+    output_path: str
+    indexed_pdfs_path: str
+
+
+@lru_cache(maxsize=1)
+def settings() -> Settings:
+    """Load ``.env`` once and return the cached ``Settings`` instance."""
+    # Load .env from project root
+    load_dotenv(dotenv_path=PROJECT_ROOT / ".env")
+    return Settings(
+        google_api_key=os.getenv("GOOGLE_API_KEY", ""),
+        chroma_persist_dir=os.getenv(
+            "CHROMA_PERSIST_DIR", str(PROJECT_ROOT / "chroma_db")
+        ),
+        docstore_path=os.getenv(
+            "DOCSTORE_PATH", str(PROJECT_ROOT / "docstore.msgpack")
+        ),
+        blobstore_path=os.getenv(
+            "BLOBSTORE_PATH", str(PROJECT_ROOT / "docstore_blobs.bin")
+        ),
+        output_path=os.getenv(
+            "OUTPUT_PATH", str(PROJECT_ROOT / "content")
+        ),
+        indexed_pdfs_path=str(PROJECT_ROOT / "indexed_pdfs.json"),
+    )
+
+
+_settings = settings()
 
 # ── API keys ────────────────────────────────────────────────────────────────
-GOOGLE_API_KEY: str = os.getenv("GOOGLE_API_KEY", "")
+GOOGLE_API_KEY: str = _settings.google_api_key
 
 # ── Paths ───────────────────────────────────────────────────────────────────
-PROJECT_ROOT = Path(__file__).resolve().parent
-
-CHROMA_PERSIST_DIR: str = os.getenv(
-    "CHROMA_PERSIST_DIR", str(PROJECT_ROOT / "chroma_db")
-)
-DOCSTORE_PATH: str = os.getenv(
-    "DOCSTORE_PATH", str(PROJECT_ROOT / "docstore.pkl")
-)
-OUTPUT_PATH: str = os.getenv(
-    "OUTPUT_PATH", str(PROJECT_ROOT / "content")
-)
-INDEXED_PDFS_PATH: str = str(PROJECT_ROOT / "indexed_pdfs.json")
+CHROMA_PERSIST_DIR: str = _settings.chroma_persist_dir
+DOCSTORE_PATH: str = _settings.docstore_path
+BLOBSTORE_PATH: str = _settings.blobstore_path
+OUTPUT_PATH: str = _settings.output_path
+INDEXED_PDFS_PATH: str = _settings.indexed_pdfs_path
 
 # ── Model names ─────────────────────────────────────────────────────────────
 GEMINI_MODEL: str = "gemini-2.0-flash"
@@ -43,7 +74,7 @@ CHUNK_NEW_AFTER: int = 6_000
 
 def validate() -> None:
     """Raise early if critical config is missing."""
-    if not GOOGLE_API_KEY:
+    if not settings().google_api_key:
         raise EnvironmentError(
             "GOOGLE_API_KEY is not set. "
             "Create a .env file in the multimodal_rag/ directory with:\n"
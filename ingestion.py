@@ -4,7 +4,6 @@ PDF ingestion — partition PDFs with ``unstructured`` and separate elements.
 
 from __future__ import annotations
 
-import base64
 from typing import Any
 
 from rich.console import Console
@@ -17,6 +16,7 @@ from config import (
     CHUNK_NEW_AFTER,
     OUTPUT_PATH,
 )
+from utils import decode_base64
 
 console = Console()
 
@@ -55,25 +55,28 @@ def partition_pdf_document(pdf_path: str) -> list[Any]:
 
 def separate_elements(
     elements: list[Any],
-) -> tuple[list[str], list[str], list[str]]:
+) -> tuple[list[str], list[str], list[bytes]]:
     """
     Separate partitioned elements into three lists:
       - **texts**: string content of ``CompositeElement``s
       - **tables**: HTML string content of ``Table``s
-      - **images**: base64-encoded image strings extracted from metadata
+      - **images**: raw image bytes extracted from metadata
+
+    All three lists are built in a single pass over *elements*.
 
     Returns ``(texts, tables, images)``.
     """
     texts: list[str] = []
     tables: list[str] = []
+    images: list[bytes] = []
 
     for el in elements:
         if isinstance(el, Table):
-            tables.append(str(el.metadata.text_as_html) if hasattr(el.metadata, "text_as_html") and el.metadata.text_as_html else str(el))
+            html = getattr(el.metadata, "text_as_html", None)
+            tables.append(str(html) if html else str(el))
         elif isinstance(el, CompositeElement):
             texts.append(str(el))
-
-    images = get_images_base64(elements)
+            _collect_images(el, images)
 
     console.print(
         f"  [dim]texts={len(texts)}  tables={len(tables)}  images={len(images)}[/]"
@@ -83,35 +86,32 @@ def separate_elements(
 
 # ── Image extraction helper ────────────────────────────────────────────────
 
-def get_images_base64(chunks: list[Any]) -> list[str]:
+def _collect_images(chunk: Any, images: list[bytes]) -> None:
     """
-    Walk through ``CompositeElement`` chunks and pull out base64 image
-    payloads stored in ``metadata.orig_elements``.
-    """
-    images: list[str] = []
+    Append the image payloads stored in *chunk*'s ``metadata.orig_elements``
+    to *images* as raw bytes.
 
-    for chunk in chunks:
-        if not isinstance(chunk, CompositeElement):
+    Images are kept decoded so the docstore does not carry base64's ~33%
+    size overhead; they are re-encoded only when sent to Gemini.
+    """
+    orig_elements = getattr(chunk.metadata, "orig_elements", None)
+    if not orig_elements:
+        return
+    for orig in orig_elements:
+        metadata = getattr(orig, "metadata", None)
+        if metadata is None:
             continue
-        orig_elements = getattr(chunk.metadata, "orig_elements", None)
-        if not orig_elements:
+        # Check for image_base64 in metadata
+        image_b64 = getattr(metadata, "image_base64", None)
+        if image_b64 and isinstance(image_b64, str):
+            images.append(decode_base64(image_b64))
             continue
-        for orig in orig_elements:
-            if hasattr(orig, "metadata"):
-                # Check for image_base64 in metadata
-                image_b64 = getattr(orig.metadata, "image_base64", None)
-                if image_b64 and isinstance(image_b64, str):
-                    images.append(image_b64)
-                    continue
-                # Fallback: check image_payload
-                payload = getattr(orig.metadata, "image_payload", None)
-                if payload and isinstance(payload, (str, bytes)):
-                    if isinstance(payload, bytes):
-                        images.append(base64.b64encode(payload).decode("utf-8"))
-                    else:
-                        images.append(payload)
-
-    return images
+        # Fallback: check image_payload
+        payload = getattr(metadata, "image_payload", None)
+        if payload and isinstance(payload, bytes):
+            images.append(payload)
+        elif payload and isinstance(payload, str):
+            images.append(decode_base64(payload))
 
 
 # ── Error diagnostics ──────────────────────────────────────────────────────
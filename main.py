@@ -6,7 +6,6 @@ Run with:  python main.py
 
 from __future__ import annotations
 
-from itertools import chain
 import os
 import sys
 from pathlib import Path
@@ -18,13 +17,7 @@ from rich.prompt import Prompt
 # Ensure the project package is importable when executed directly.
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
-from config import (
-    CHROMA_PERSIST_DIR,
-    DOCSTORE_PATH,
-    GOOGLE_API_KEY,
-    INDEXED_PDFS_PATH,
-    validate,
-)
+from config import DOCSTORE_PATH, INDEXED_PDFS_PATH, validate
 from ingestion import partition_pdf_document, separate_elements
 from summarizer import summarise_images, summarise_tables, summarise_texts
 from utils import load_docstore, load_indexed_pdfs, save_indexed_pdf, truncate
@@ -90,11 +83,11 @@ def _upload_pdf() -> None:
         _vectorstore,
         _docstore,
         text_summaries=text_summaries,
-        texts=list(texts),
+        texts=texts,
         table_summaries=table_summaries,
-        tables=list(tables),
+        tables=tables,
         image_summaries=image_summaries,
-        images_b64=list(images),
+        images=images,
         docstore_path=DOCSTORE_PATH,
     )
 
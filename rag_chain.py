@@ -4,73 +4,93 @@ RAG query chain — multimodal retrieval + Gemini answer generation.
 
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Any
 
 from langchain_core.messages import HumanMessage
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.runnables import RunnableLambda, RunnablePassthrough
 from langchain_google_genai import ChatGoogleGenerativeAI
+from rich.console import Console
 
 from config import GEMINI_MODEL, GOOGLE_API_KEY
-from utils import is_base64_image
+from utils import BlobHandle, image_to_base64
+
+console = Console()
+
+
+# ── Model factory ──────────────────────────────────────────────────────────
+
+@lru_cache(maxsize=1)
+def _llm() -> ChatGoogleGenerativeAI:
+    """Return the shared answer-generation model (built on first use)."""
+    return ChatGoogleGenerativeAI(
+        model=GEMINI_MODEL,
+        google_api_key=GOOGLE_API_KEY,
+        temperature=0.2,
+    )
 
 
 # ── Document parsing ───────────────────────────────────────────────────────
 
-def parse_docs(docs: list[Any]) -> dict[str, list[str]]:
+def parse_docs(docs: list[Any]) -> dict[str, list[Any]]:
     """
     Split retrieved documents into ``texts`` and ``images``.
 
     Documents coming from the docstore are either:
       - plain-text / HTML table strings  →  ``texts``
-      - base64-encoded image strings      →  ``images``
+      - ``BlobHandle``s / raw image bytes →  ``images``
+
+    Legacy base64 image strings are converted to blobs when the docstore is
+    loaded, so classification is a type check.
     """
     texts: list[str] = []
-    images: list[str] = []
+    images: list[BlobHandle | bytes] = []
 
     for doc in docs:
+        if isinstance(doc, (BlobHandle, bytes, bytearray)):
+            images.append(doc)
+            continue
         content = doc if isinstance(doc, str) else getattr(doc, "page_content", str(doc))
-        if is_base64_image(content):
-            images.append(content)
-        else:
-            texts.append(content)
+        texts.append(content)
 
     return {"texts": texts, "images": images}
 
 
 # ── Prompt builder ─────────────────────────────────────────────────────────
 
-def build_prompt(parsed: dict[str, list[str]], question: str) -> list[HumanMessage]:
+_INSTRUCTION_PREFIX = (
+    "You are a knowledgeable assistant. Answer the user's question using ONLY "
+    "the provided context (text, tables, and images). If the context does not "
+    "contain the answer, say so honestly.\n\n"
+)
+_CONTEXT_SEPARATOR = "\n\n---\n\n"
+_DATA_URI_PREFIX = "data:image/jpeg;base64,"
+
+
+def build_prompt(parsed: dict[str, list[Any]], question: str) -> list[HumanMessage]:
     """
     Build a multimodal Gemini prompt.
 
     Text context and the user question go as plain text; images are inlined
     as base64 ``image_url`` parts.
     """
-    content: list[dict[str, Any]] = []
-
     # System-style instruction
-    context_text = "\n\n---\n\n".join(parsed["texts"]) if parsed["texts"] else ""
-    instruction = (
-        "You are a knowledgeable assistant. Answer the user's question using ONLY "
-        "the provided context (text, tables, and images). If the context does not "
-        "contain the answer, say so honestly.\n\n"
-    )
-    if context_text:
-        instruction += f"CONTEXT:\n{context_text}\n\n"
-
-    instruction += f"QUESTION:\n{question}"
-
-    content.append({"type": "text", "text": instruction})
-
-    # Inline images
-    for img_b64 in parsed.get("images", []):
-        content.append(
-            {
-                "type": "image_url",
-                "image_url": {"url": f"data:image/jpeg;base64,{img_b64}"},
-            }
-        )
+    parts = [_INSTRUCTION_PREFIX]
+    if parsed["texts"]:
+        parts += ("CONTEXT:\n", _CONTEXT_SEPARATOR.join(parsed["texts"]), "\n\n")
+    parts += ("QUESTION:\n", question)
+
+    content: list[dict[str, Any]] = [{"type": "text", "text": "".join(parts)}]
+
+    # Inline images; one unreadable blob should not sink the whole answer.
+    for image in parsed.get("images", []):
+        try:
+            url = _DATA_URI_PREFIX + image_to_base64(image)
+        except OSError as exc:
+            console.print(f"[yellow]⚠ Skipping unreadable image: {exc}[/]")
+            continue
+        content.append({"type": "image_url", "image_url": {"url": url}})
 
     return [HumanMessage(content=content)]
 
@@ -83,11 +103,7 @@ def build_rag_chain(retriever: Any):
 
         question → retriever → parse → prompt → Gemini → answer string
     """
-    llm = ChatGoogleGenerativeAI(
-        model=GEMINI_MODEL,
-        google_api_key=GOOGLE_API_KEY,
-        temperature=0.2,
-    )
+    llm = _llm()
 
     chain = (
         {
@@ -110,11 +126,7 @@ def build_rag_chain_with_sources(retriever: Any):
     retrieved source documents (useful for showing page numbers or
     source context to the user).
     """
-    llm = ChatGoogleGenerativeAI(
-        model=GEMINI_MODEL,
-        google_api_key=GOOGLE_API_KEY,
-        temperature=0.2,
-    )
+    llm = _llm()
 
     def _answer_and_sources(inputs: Any) -> dict[str, Any]:
         question = inputs if isinstance(inputs, str) else inputs["question"]
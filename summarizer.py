@@ -5,6 +5,7 @@ using Google Gemini via LangChain.
 
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Sequence
 
 from langchain_core.messages import HumanMessage
@@ -12,9 +13,10 @@ from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_google_genai import ChatGoogleGenerativeAI
 from rich.console import Console
-from rich.progress import track
+from rich.progress import Progress
 
 from config import GEMINI_MODEL, GOOGLE_API_KEY, SUMMARISE_CONCURRENCY, SUMMARISE_TEMPERATURE
+from utils import image_to_base64
 
 console = Console()
 
@@ -37,6 +39,7 @@ _IMAGE_SUMMARY_INSTRUCTION = (
 
 # ── Model factory ──────────────────────────────────────────────────────────
 
+@lru_cache(maxsize=4)
 def _llm(temperature: float = SUMMARISE_TEMPERATURE) -> ChatGoogleGenerativeAI:
     return ChatGoogleGenerativeAI(
         model=GEMINI_MODEL,
@@ -57,6 +60,9 @@ def summarise_texts(
 
     Uses ``RunnableParallel``-style batching with *concurrency* to avoid
     rate-limit issues while still being faster than sequential calls.
+    Texts are dispatched longest-first so each batch holds chunks of similar
+    length and short requests do not sit waiting on a long one; results are
+    returned in the original order.
     """
     if not texts:
         return []
@@ -64,21 +70,28 @@ def summarise_texts(
     chain = _TEXT_SUMMARY_PROMPT | _llm() | StrOutputParser()
 
     console.print(f"[cyan]Summarising {len(texts)} text/table elements …[/]")
-    summaries: list[str] = []
+    summaries: list[str] = [""] * len(texts)
+    order = sorted(range(len(texts)), key=lambda i: len(texts[i]), reverse=True)
 
     # Process in batches of `concurrency`
-    for i in range(0, len(texts), concurrency):
-        batch = texts[i : i + concurrency]
-        inputs = [{"element": t} for t in batch]
-        try:
-            results = chain.batch(inputs, config={"max_concurrency": concurrency})
-            summaries.extend(results)
-        except Exception as exc:
-            console.print(f"[yellow]⚠ Batch summarisation error: {exc}[/]")
-            # Fallback: use truncated originals
-            summaries.extend([t[:500] for t in batch])
-
-        console.print(f"  [dim]Processed {min(i + concurrency, len(texts))}/{len(texts)}[/]")
+    with Progress(console=console, transient=True) as progress:
+        task = progress.add_task("Summarising", total=len(texts))
+        for i in range(0, len(order), concurrency):
+            batch_idx = order[i : i + concurrency]
+            batch = [texts[j] for j in batch_idx]
+            inputs = [{"element": t} for t in batch]
+            try:
+                results = chain.batch(inputs, config={"max_concurrency": concurrency})
+            except Exception as exc:
+                console.print(f"[yellow]⚠ Batch summarisation error: {exc}[/]")
+                # Fallback: use truncated originals
+                results = [t[:500] for t in batch]
+
+            for j, summary in zip(batch_idx, results):
+                summaries[j] = summary
+            progress.advance(task, len(batch))
+
+    console.print(f"[green]✓ Summarised {len(texts)} text/table element(s).[/]")
 
     return summaries
 
@@ -95,40 +108,58 @@ def summarise_tables(
 # ── Image summarisation ────────────────────────────────────────────────────
 
 def summarise_images(
-    images_b64: Sequence[str],
+    images: Sequence[bytes],
+    *,
+    concurrency: int = SUMMARISE_CONCURRENCY,
 ) -> list[str]:
     """
-    Summarise a list of base64-encoded images using Gemini's multimodal
-    input.  Each image is sent individually to avoid overwhelming the
-    context window.
+    Summarise a list of raw images using Gemini's multimodal
+    input.  Each image is sent as its own request, but requests are
+    batched with *concurrency* in flight at once.
     """
-    if not images_b64:
+    if not images:
         return []
 
-    llm = _llm(temperature=0.3)
+    llm = _llm()
     summaries: list[str] = []
 
-    console.print(f"[cyan]Summarising {len(images_b64)} image(s) …[/]")
-
-    for idx, img_b64 in enumerate(images_b64, 1):
-        message = HumanMessage(
-            content=[
-                {"type": "text", "text": _IMAGE_SUMMARY_INSTRUCTION},
-                {
-                    "type": "image_url",
-                    "image_url": {
-                        "url": f"data:image/jpeg;base64,{img_b64}"
-                    },
-                },
-            ]
-        )
-        try:
-            response = llm.invoke([message])
-            summaries.append(response.content)
-        except Exception as exc:
-            console.print(f"[yellow]⚠ Image {idx} summarisation failed: {exc}[/]")
-            summaries.append("[Image — summary unavailable]")
-
-        console.print(f"  [dim]Image {idx}/{len(images_b64)} done[/]")
+    console.print(f"[cyan]Summarising {len(images)} image(s) …[/]")
+
+    with Progress(console=console, transient=True) as progress:
+        task = progress.add_task("Summarising images", total=len(images))
+        for i in range(0, len(images), concurrency):
+            batch = images[i : i + concurrency]
+            inputs = [[_image_message(image)] for image in batch]
+            # Failures come back per item, so one bad image only costs its
+            # own summary and the successful calls are not repeated.
+            responses = llm.batch(
+                inputs,
+                config={"max_concurrency": concurrency},
+                return_exceptions=True,
+            )
+            for idx, response in enumerate(responses, i + 1):
+                if isinstance(response, Exception):
+                    console.print(f"[yellow]⚠ Image {idx} summarisation failed: {response}[/]")
+                    summaries.append("[Image — summary unavailable]")
+                else:
+                    summaries.append(response.content)
+
+            progress.advance(task, len(batch))
+
+    console.print(f"[green]✓ Summarised {len(images)} image(s).[/]")
 
     return summaries
+
+
+def _image_message(image: bytes) -> HumanMessage:
+    return HumanMessage(
+        content=[
+            {"type": "text", "text": _IMAGE_SUMMARY_INSTRUCTION},
+            {
+                "type": "image_url",
+                "image_url": {
+                    "url": f"data:image/jpeg;base64,{image_to_base64(image)}"
+                },
+            },
+        ]
+    )
@@ -4,79 +4,330 @@ Utility helpers — base64 handling, display formatting, persistence helpers.
 
 from __future__ import annotations
 
-import base64
+import itertools
 import json
+import mmap
 import os
 import pickle
-import re
+import string
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO, Iterable
+
+import msgpack
+import pybase64 as _b64  # SIMD-accelerated (AVX2/AVX-512/NEON) ``base64``
 from langchain_classic.storage import InMemoryStore
+from rich.console import Console
+
+from config import BLOBSTORE_PATH
 
+console = Console()
 
 # ── Base64 helpers ──────────────────────────────────────────────────────────
 
+# Characters allowed in the body of a base64 payload (padding handled apart).
+_B64_ALPHABET = (string.ascii_letters + string.digits + "+/\n\r").encode("ascii")
+_B64_FIRST = frozenset(string.ascii_letters + string.digits + "+/")
+_B64_LAST = _B64_FIRST | {"="}
+
+# Image payloads in this pipeline come from ``b64encode`` of whole image
+# files, so anything shorter than this is treated as text.
+_MIN_IMAGE_B64_LEN = 1024
+# Only this many leading characters are checked against the alphabet.
+_B64_SCAN_LEN = 128
+
+
 def is_base64_image(text: str) -> bool:
     """Return True if *text* looks like a base64-encoded image string."""
     if not isinstance(text, str):
         return False
-    # Quick heuristic: long string with only base64 chars
-    if len(text) < 200:
+    # Quick heuristic: long, 4-aligned (padded) string whose first and last
+    # characters are base64 — rejects nearly all text without a scan.
+    n = len(text)
+    if (
+        n < _MIN_IMAGE_B64_LEN
+        or n & 3
+        or text[0] not in _B64_FIRST
+        or text[-1] not in _B64_LAST
+    ):
+        return False
+    # Check a prefix to avoid scanning megabytes (padding can only occur in
+    # the final two characters, so the prefix never contains ``=``).
+    prefix = text[:_B64_SCAN_LEN]
+    if not prefix.isascii():
         return False
-    b64_pattern = re.compile(r"^[A-Za-z0-9+/\n\r]+=*$")
-    # Check a prefix to avoid scanning megabytes
-    return bool(b64_pattern.match(text[:500]))
+    # ``bytes.translate`` deletes every alphabet byte in one C-level table
+    # pass; anything left over is a non-base64 character.
+    return not prefix.encode("ascii").translate(None, _B64_ALPHABET)
 
 
 def encode_image_to_base64(image_path: str) -> str:
     """Read a local image file and return its base64-encoded content."""
-    with open(image_path, "rb") as f:
-        return base64.b64encode(f.read()).decode("utf-8")
+    return encode_bytes_to_base64(Path(image_path).read_bytes())
+
+
+def encode_bytes_to_base64(data: bytes) -> str:
+    """Encode raw *data* to a base64 string."""
+    return _b64.b64encode(data).decode("ascii")
 
 
 def decode_base64(b64_string: str) -> bytes:
     """Decode a base64 string to raw bytes."""
-    return base64.b64decode(b64_string)
+    return _b64.b64decode(b64_string, validate=False)
+
+
+def image_to_base64(image: BlobHandle | bytes) -> str:
+    """Return the base64 text for an image held as a ``BlobHandle`` or bytes."""
+    if isinstance(image, BlobHandle):
+        image = image.read()
+    return encode_bytes_to_base64(image)
+
+
+# ── Image blob file ────────────────────────────────────────────────────────
+
+@dataclass(frozen=True, slots=True)
+class BlobHandle:
+    """
+    Location of an image payload in the append-only blob file at
+    ``BLOBSTORE_PATH``.
+
+    Only the ``(offset, length)`` pair is persisted; the file itself is
+    resolved from config when reading, so moving the project (and pointing
+    ``BLOBSTORE_PATH`` at the moved file) does not invalidate stored handles.
+    """
+
+    offset: int
+    length: int
+
+    def read(self) -> bytes:
+        """
+        Return the payload bytes via a read-only mmap.
+
+        Raises ``OSError`` if the blob file is missing or truncated.
+        """
+        end = self.offset + self.length
+        if os.path.getsize(BLOBSTORE_PATH) < end:
+            raise OSError(f"Blob file {BLOBSTORE_PATH} is truncated")
+        with open(BLOBSTORE_PATH, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mm:
+            return mm[self.offset : end]
+
+
+def append_blobs(payloads: Iterable[bytes]) -> list[BlobHandle]:
+    """Append *payloads* to the blob file and return their handles."""
+    handles: list[BlobHandle] = []
+    os.makedirs(os.path.dirname(BLOBSTORE_PATH) or ".", exist_ok=True)
+    with open(BLOBSTORE_PATH, "ab") as f:
+        offset = f.seek(0, os.SEEK_END)
+        for data in payloads:
+            f.write(data)
+            handles.append(BlobHandle(offset, len(data)))
+            offset += len(data)
+    return handles
 
 
 # ── Docstore persistence ───────────────────────────────────────────────────
 
+# The docstore file is an append-only log of msgpack ``[key, value]``
+# frames; when a key repeats, the last frame wins.  ``BlobHandle`` values
+# are stored as a msgpack extension type.
+
+_BLOB_EXT_CODE = 1
+
+
 def save_docstore(store: InMemoryStore, path: str) -> None:
-    """Pickle the InMemoryStore's internal dict to *path*."""
-    internal: dict[str, Any] = {}
-    for key in store.yield_keys():
-        vals = store.mget([key])
-        if vals and vals[0] is not None:
-            internal[key] = vals[0]
+    """
+    Rewrite *path* with one frame per entry of *store*, dropping superseded
+    frames.  The new log is written beside *path* and swapped in atomically.
+    """
+    keys = list(store.yield_keys())
+    vals = store.mget(keys)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        _write_frames(f, ((k, v) for k, v in zip(keys, vals) if v is not None))
+    os.replace(tmp, path)
+
+
+def append_docstore(items: Iterable[tuple[str, Any]], path: str) -> None:
+    """Append *items* to the docstore log at *path* without rewriting it."""
     os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
-    with open(path, "wb") as f:
-        pickle.dump(internal, f)
+    with open(path, "ab") as f:
+        _write_frames(f, items)
 
 
 def load_docstore(path: str) -> InMemoryStore:
-    """Load a pickled InMemoryStore from *path*, or return a fresh one."""
+    """
+    Load a docstore log from *path*, or return a fresh store.
+
+    A pickled docstore from earlier versions — either at *path* itself or at
+    the old ``.pkl`` name beside it — is migrated first (see
+    ``_migrate_pickle_docstore``).
+    """
+    if _is_pickle(path):
+        _migrate_pickle_docstore(path, path)
+    elif not os.path.exists(path):
+        legacy = str(Path(path).with_suffix(".pkl"))
+        if _is_pickle(legacy):
+            _migrate_pickle_docstore(legacy, path)
+
     store = InMemoryStore()
-    if os.path.exists(path):
-        with open(path, "rb") as f:
-            internal: dict[str, Any] = pickle.load(f)  # noqa: S301
-        if internal:
-            store.mset(list(internal.items()))
+    frames = 0
+    if os.path.exists(path) and os.path.getsize(path) > 0:
+        with open(path, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mm:
+            # Stream frames straight into the store; later frames overwrite
+            # earlier ones for the same key.
+            unpacker = msgpack.Unpacker(mm, raw=False, ext_hook=_unpack_ext)
+            # zip() stops on the exhausted unpacker before advancing the
+            # counter, so its next value is the number of frames read.
+            counter = itertools.count()
+            try:
+                store.mset(frame for frame, _ in zip(unpacker, counter))
+                frames = next(counter)
+            except (ValueError, TypeError) as exc:
+                raise ValueError(
+                    f"{path} is not a valid docstore file ({exc}). "
+                    "Point DOCSTORE_PATH at a docstore written by this version, "
+                    "or remove the file and re-index your PDFs."
+                ) from exc
+
+    # Re-appended keys leave superseded frames behind; compact them away.
+    if frames > sum(1 for _ in store.yield_keys()):
+        save_docstore(store, path)
     return store
 
 
+def _write_frames(f: BinaryIO, items: Iterable[tuple[str, Any]]) -> None:
+    packer = msgpack.Packer(use_bin_type=True, default=_pack_ext)
+    for key, value in items:
+        f.write(packer.pack([key, value]))
+
+
+def _pack_ext(obj: Any) -> msgpack.ExtType:
+    if isinstance(obj, BlobHandle):
+        return msgpack.ExtType(
+            _BLOB_EXT_CODE,
+            msgpack.packb([obj.offset, obj.length]),
+        )
+    raise TypeError(f"Cannot serialise {type(obj).__name__} to the docstore")
+
+
+def _unpack_ext(code: int, data: bytes) -> Any:
+    if code == _BLOB_EXT_CODE:
+        return BlobHandle(*msgpack.unpackb(data, raw=False))
+    return msgpack.ExtType(code, data)
+
+
+# ── Legacy pickle migration ────────────────────────────────────────────────
+
+# Magic prefixes of the image formats ``unstructured`` extracts.
+_IMAGE_MAGIC = (
+    b"\xff\xd8\xff",          # JPEG
+    b"\x89PNG\r\n\x1a\n",     # PNG
+    b"GIF87a", b"GIF89a",
+    b"RIFF",                  # WebP
+    b"BM",                    # BMP
+    b"II*\x00", b"MM\x00*",   # TIFF
+)
+
+
+def _is_pickle(path: str) -> bool:
+    """Return True if *path* starts with a pickle (protocol >= 2) header."""
+    if not os.path.isfile(path):
+        return False
+    with open(path, "rb") as f:
+        return f.read(1) == b"\x80"
+
+
+def _migrate_pickle_docstore(src: str, dest: str) -> None:
+    """
+    Convert the pickled docstore at *src* into a msgpack log at *dest*.
+
+    Keys are kept, so summaries already in ChromaDB still resolve.  Base64
+    image strings are decoded and moved into the blob file.  When *src* and
+    *dest* are the same file the original is kept as ``<dest>.bak``.
+    """
+    console.print(f"[yellow]Migrating legacy pickle docstore {src} → {dest} …[/]")
+    with open(src, "rb") as f:
+        internal: dict[str, Any] = pickle.load(f)  # noqa: S301
+
+    image_keys: list[str] = []
+    payloads: list[bytes] = []
+    for key, value in internal.items():
+        data = _decode_legacy_image(value)
+        if data is not None:
+            image_keys.append(key)
+            payloads.append(data)
+    for key, handle in zip(image_keys, append_blobs(payloads)):
+        internal[key] = handle
+
+    tmp = dest + ".tmp"
+    os.makedirs(os.path.dirname(dest) or ".", exist_ok=True)
+    with open(tmp, "wb") as f:
+        _write_frames(f, internal.items())
+    if src == dest:
+        os.replace(dest, dest + ".bak")
+    os.replace(tmp, dest)
+    console.print(
+        f"[green]✓ Migrated {len(internal)} entries "
+        f"({len(image_keys)} image(s) moved to {BLOBSTORE_PATH}).[/]"
+    )
+
+
+def _decode_legacy_image(value: Any) -> bytes | None:
+    """
+    Return the image bytes if *value* is a legacy base64 image string.
+
+    Long payloads are recognised by ``is_base64_image``; shorter ones (small
+    icons below its length floor) only if they decode to a known image
+    signature.
+    """
+    if not isinstance(value, str) or len(value) & 3 or not value.isascii():
+        return None
+    try:
+        data = _b64.b64decode(value, validate=True)
+    except ValueError:
+        return None
+    if is_base64_image(value) or data.startswith(_IMAGE_MAGIC):
+        return data
+    return None
+
+
 # ── Indexed-PDF registry ───────────────────────────────────────────────────
 
+# Registry contents keyed by JSON path, populated on first load so later
+# lookups and saves do not re-read the file.
+_indexed_cache: dict[str, set[str]] = {}
+
+
 def load_indexed_pdfs(json_path: str) -> set[str]:
     """Return set of already-indexed PDF filenames."""
-    if os.path.exists(json_path):
-        with open(json_path, "r", encoding="utf-8") as f:
-            return set(json.load(f))
-    return set()
+    cached = _indexed_cache.get(json_path)
+    if cached is None:
+        cached = set()
+        if os.path.exists(json_path):
+            with open(json_path, "r", encoding="utf-8") as f:
+                cached = set(json.load(f))
+        _indexed_cache[json_path] = cached
+    return set(cached)
 
 
 def save_indexed_pdf(filename: str, json_path: str) -> None:
-    """Append *filename* to the indexed-PDF registry."""
-    existing = load_indexed_pdfs(json_path)
+    """
+    Append *filename* to the indexed-PDF registry.
+
+    The registry is read from the in-process cache rather than re-parsed.
+    When *filename* is new, the whole (sorted) JSON list is rewritten, which
+    is cheap at one write per ingested PDF.
+    """
+    if json_path not in _indexed_cache:
+        load_indexed_pdfs(json_path)
+    existing = _indexed_cache[json_path]
+    if filename in existing:
+        return
     existing.add(filename)
     os.makedirs(os.path.dirname(json_path) or ".", exist_ok=True)
     with open(json_path, "w", encoding="utf-8") as f:
@@ -7,7 +7,7 @@ context to the LLM.
 
 from __future__ import annotations
 
-import uuid
+from hashlib import blake2b
 from typing import Sequence
 
 from langchain_classic.retrievers.multi_vector import MultiVectorRetriever
@@ -18,7 +18,7 @@ from langchain_google_genai import GoogleGenerativeAIEmbeddings
 from rich.console import Console
 
 from config import CHROMA_PERSIST_DIR, EMBEDDING_MODEL, GOOGLE_API_KEY
-from utils import save_docstore
+from utils import BlobHandle, append_blobs, append_docstore
 
 console = Console()
 
@@ -70,65 +70,98 @@ def get_retriever(
 
 # ── Indexing helpers ────────────────────────────────────────────────────────
 
-def add_texts_to_store(
+def content_id(original: str | bytes) -> str:
+    """
+    Return the doc id for *original*: a 128-bit BLAKE2b hash of its content.
+
+    The same id is used for the Chroma record and the docstore key, so
+    re-ingesting an unchanged element is a lookup in both.
+    """
+    data = original.encode("utf-8") if isinstance(original, str) else original
+    return blake2b(data, digest_size=16).hexdigest()
+
+
+def _novel(
     vectorstore: Chroma,
     docstore: InMemoryStore,
     summaries: Sequence[str],
-    originals: Sequence[str],
+    originals: Sequence[str | bytes],
+) -> tuple[list[str], list[str], list[str | bytes | BlobHandle]]:
+    """
+    Return ``(doc_ids, summaries, originals)`` for the entries that are not
+    fully indexed yet — i.e. missing from *docstore* or from *vectorstore*
+    — skipping repeats within the same batch.  An entry already in the
+    docstore keeps its stored value, so images are not spooled twice.
+    """
+    ids = [content_id(o) for o in originals]
+    if not ids:
+        return [], [], []
+    in_docstore = docstore.mget(ids)
+    # The docstore alone is not proof of indexing: the Chroma directory may
+    # have been wiped or moved while the docstore survived.
+    in_chroma = set(vectorstore.get(ids=list(set(ids)), include=[])["ids"])
+    seen: set[str] = set()
+    new_ids: list[str] = []
+    new_summaries: list[str] = []
+    new_originals: list[str | bytes | BlobHandle] = []
+    for doc_id, found, summary, original in zip(ids, in_docstore, summaries, originals):
+        if (found is not None and doc_id in in_chroma) or doc_id in seen:
+            continue
+        seen.add(doc_id)
+        new_ids.append(doc_id)
+        new_summaries.append(summary)
+        new_originals.append(original if found is None else found)
+    return new_ids, new_summaries, new_originals
+
+
+def _index(
+    vectorstore: Chroma,
+    docstore: InMemoryStore,
+    doc_ids: Sequence[str],
+    summaries: Sequence[str],
+    originals: Sequence[str | bytes | BlobHandle],
     *,
     docstore_path: str,
 ) -> None:
     """
-    Index *summaries* into ChromaDB and store *originals* in the docstore,
-    linked by UUID.
+    Embed *summaries* and store *originals* under *doc_ids*.  ``bytes``
+    originals are images: they are appended to the blob file and stored in
+    the docstore as ``BlobHandle``s.
     """
-    if not summaries:
+    if not doc_ids:
         return
 
-    doc_ids = [str(uuid.uuid4()) for _ in summaries]
-
     # Summary documents carry the doc_id so the retriever can look up the
-    # original in the docstore.
+    # original in the docstore.  Using the same id as the Chroma id makes
+    # re-adding an element an idempotent upsert.
     summary_docs = [
         Document(page_content=s, metadata={_ID_KEY: doc_ids[i]})
         for i, s in enumerate(summaries)
     ]
 
-    vectorstore.add_documents(summary_docs)
-
-    # Store originals keyed by the same UUID.
-    docstore.mset(list(zip(doc_ids, originals)))
-
-    # Persist docstore to disk after every batch.
-    save_docstore(docstore, docstore_path)
-
-
-def add_images_to_store(
-    vectorstore: Chroma,
-    docstore: InMemoryStore,
-    image_summaries: Sequence[str],
-    images_b64: Sequence[str],
-    *,
-    docstore_path: str,
-) -> None:
-    """
-    Index image *summaries* into ChromaDB and store the original base64
-    image strings in the docstore.
-    """
-    if not image_summaries:
-        return
+    vectorstore.add_documents(summary_docs, ids=list(doc_ids))
 
-    doc_ids = [str(uuid.uuid4()) for _ in image_summaries]
+    # Spool images only once embedding has succeeded, so a failed
+    # add_documents leaves no orphaned bytes in the blob file.
+    originals = _spool_images(originals)
 
-    summary_docs = [
-        Document(page_content=s, metadata={_ID_KEY: doc_ids[i]})
-        for i, s in enumerate(image_summaries)
-    ]
+    # Store originals keyed by the same id.
+    docstore.mset(zip(doc_ids, originals))
+    append_docstore(zip(doc_ids, originals), docstore_path)
 
-    vectorstore.add_documents(summary_docs)
-    docstore.mset(list(zip(doc_ids, images_b64)))
 
-    save_docstore(docstore, docstore_path)
+def _spool_images(
+    originals: Sequence[str | bytes | BlobHandle],
+) -> list[str | BlobHandle]:
+    """Replace the ``bytes`` entries of *originals* with blob handles."""
+    stored: list[str | BlobHandle] = list(originals)
+    image_pos = [i for i, o in enumerate(originals) if isinstance(o, bytes)]
+    if not image_pos:
+        return stored
+    handles = append_blobs(originals[i] for i in image_pos)
+    for i, handle in zip(image_pos, handles):
+        stored[i] = handle
+    return stored
 
 
 # ── Convenience: full indexing pipeline ─────────────────────────────────────
@@ -142,25 +175,38 @@ def index_all(
     table_summaries: Sequence[str],
     tables: Sequence[str],
     image_summaries: Sequence[str],
-    images_b64: Sequence[str],
+    images: Sequence[bytes],
     docstore_path: str,
 ) -> None:
-    """Index texts, tables, and images in one call."""
-    console.print("[cyan]Indexing text summaries …[/]")
-    add_texts_to_store(
-        vectorstore, docstore, text_summaries, texts,
-        docstore_path=docstore_path,
-    )
+    """
+    Index texts, tables, and images in one call.
 
-    console.print("[cyan]Indexing table summaries …[/]")
-    add_texts_to_store(
-        vectorstore, docstore, table_summaries, tables,
-        docstore_path=docstore_path,
+    All three categories are embedded in a single ``add_documents`` request
+    and written to the docstore in one append.  Raw image bytes are appended
+    to the blob file (``BLOBSTORE_PATH``) and the docstore keeps only a
+    ``BlobHandle`` to each, so image data is not held in memory.  Elements
+    already present in both the docstore and ChromaDB are skipped.
+    """
+    text_ids, new_summaries, new_texts = _novel(
+        vectorstore, docstore,
+        [*text_summaries, *table_summaries], [*texts, *tables],
+    )
+    image_ids, new_image_summaries, new_images = _novel(
+        vectorstore, docstore, image_summaries, images
     )
 
-    console.print("[cyan]Indexing image summaries …[/]")
-    add_images_to_store(
-        vectorstore, docstore, image_summaries, images_b64,
+    total = len(text_summaries) + len(table_summaries) + len(image_summaries)
+    skipped = total - len(text_ids) - len(image_ids)
+    console.print(
+        f"[cyan]Indexing {total - skipped} summaries "
+        f"(texts={len(text_summaries)}  tables={len(table_summaries)}  "
+        f"images={len(image_summaries)}  already indexed={skipped}) …[/]"
+    )
+    _index(
+        vectorstore, docstore,
+        [*text_ids, *image_ids],
+        [*new_summaries, *new_image_summaries],
+        [*new_texts, *new_images],
         docstore_path=docstore_path,
     )
 